@@ -0,0 +1,108 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""Nucleo opzionale in Cython per la generazione delle password.
+
+Replica `_generate_from_pools` lavorando direttamente su byte: legge
+l'entropia da `os.urandom` a blocchi, estrae gli indici con rejection
+sampling e mescola con Fisher-Yates (riduzione di Lemire su 32 bit).
+Se l'estensione non è compilata, il modulo Python usa il percorso puro.
+"""
+
+from os import urandom
+
+from cpython.bytes cimport PyBytes_AS_STRING, PyBytes_FromStringAndSize
+from libc.stdint cimport uint32_t, uint64_t
+
+
+cdef class _Entropy:
+    """Buffer di byte casuali che si ricarica da `os.urandom` quando finisce."""
+
+    cdef bytes _buf
+    cdef const unsigned char* _data
+    cdef Py_ssize_t _pos
+    cdef Py_ssize_t _size
+
+    def __cinit__(self, Py_ssize_t size):
+        self._size = size if size > 0 else 64
+        self._refill()
+
+    cdef int _refill(self) except -1:
+        self._buf = urandom(self._size)
+        self._data = <const unsigned char*> PyBytes_AS_STRING(self._buf)
+        self._pos = 0
+        return 0
+
+    cdef int byte(self) except -1:
+        if self._pos >= self._size:
+            self._refill()
+        self._pos += 1
+        return self._data[self._pos - 1]
+
+    cdef long long u32(self) except -1:
+        cdef uint32_t x = 0
+        cdef int k
+        for k in range(4):
+            x = (x << 8) | <uint32_t> self.byte()
+        return x
+
+    cdef int below_256(self, int bound) except -1:
+        """Indice uniforme in [0, bound) per bound <= 256 (rejection sampling)."""
+        cdef int threshold = 256 - (256 % bound)
+        cdef int b = self.byte()
+        while b >= threshold:
+            b = self.byte()
+        return b % bound
+
+    cdef long long below(self, uint32_t bound) except -1:
+        """Indice uniforme in [0, bound) con la riduzione di Lemire (senza bias)."""
+        cdef uint64_t m = <uint64_t> self.u32() * bound
+        cdef uint32_t low = <uint32_t> m
+        cdef uint32_t threshold
+        if low < bound:
+            threshold = (<uint32_t> -bound) % bound
+            while low < threshold:
+                m = <uint64_t> self.u32() * bound
+                low = <uint32_t> m
+        return <long long> (m >> 32)
+
+
+def generate_from_pools(Py_ssize_t length, tuple cats, bytes full_pool):
+    """Genera `length` byte ASCII: uno per categoria di `cats`, il resto da `full_pool`."""
+    cdef Py_ssize_t n_cats = len(cats)
+    cdef Py_ssize_t pool_size = len(full_pool)
+    cdef Py_ssize_t i, j
+    cdef bytes cat
+    cdef const unsigned char* pool
+    cdef char* dst
+    cdef char tmp
+    cdef _Entropy ent
+
+    if not 0 < pool_size <= 256:
+        raise ValueError("Il pool deve contenere tra 1 e 256 caratteri.")
+    if length < n_cats or length > 0xFFFFFFFF:
+        raise ValueError("Lunghezza non valida per le categorie richieste.")
+    for cat in cats:
+        if not 0 < len(cat) <= 256:
+            raise ValueError("Ogni categoria deve contenere tra 1 e 256 caratteri.")
+
+    out = PyBytes_FromStringAndSize(NULL, length)
+    dst = PyBytes_AS_STRING(out)
+    pool = <const unsigned char*> PyBytes_AS_STRING(full_pool)
+    ent = _Entropy(2 * length + 64)
+
+    # 1 char garantito per categoria
+    for i in range(n_cats):
+        cat = cats[i]
+        dst[i] = cat[ent.below_256(len(cat))]
+
+    # Riempi il resto
+    for i in range(n_cats, length):
+        dst[i] = pool[ent.below_256(pool_size)]
+
+    # Mescola (Fisher-Yates)
+    for i in range(length - 1, 0, -1):
+        j = ent.below(<uint32_t> (i + 1))
+        tmp = dst[i]
+        dst[i] = dst[j]
+        dst[j] = tmp
+
+    return out
@@ -21,17 +21,25 @@ Esempi:
 from __future__ import annotations
 
 import argparse
+import functools
 import logging
 import math
 import secrets
 import string
 from dataclasses import dataclass
-from typing import Iterable, List, Sequence
+from typing import List, MutableSequence, Sequence, Tuple
+
+try:
+    # estensione Cython opzionale (vedi setup.py)
+    from ._core import generate_from_pools as _core_generate
+except ImportError:
+    _core_generate = None
 
 __all__ = [
     "PasswordPolicy",
     "generate_password",
     "estimate_entropy_bits",
+    "estimate_entropy_bits_precomputed",
     "build_full_pool",
     "build_parser",
     "main",
@@ -60,14 +68,29 @@ AMBIGUOUS: set[str] = set("Il1O0o|`~'\" ")
 DEFAULT_SYMBOLS: str = string.punctuation
 """Set di simboli usati per default (puoi personalizzarlo)."""
 
-_RNG = secrets.SystemRandom()
-"""Mescolatore sicuro basato su os.urandom."""
+_U64_MASK = (1 << 64) - 1
+"""Maschera a 64 bit per la riduzione di Lemire nel mescolamento."""
+
+_AMBIG_DELETE_TABLE = str.maketrans("", "", "".join(AMBIGUOUS))
+"""Tabella per `str.translate` che elimina i caratteri ambigui."""
+
+_AMBIG_MASK = sum(1 << ord(ch) for ch in AMBIGUOUS)
+"""Bitmask dei caratteri ambigui (bit `ord(ch)` acceso se `ch` è ambiguo)."""
+
+_LOWER_NOAMB = string.ascii_lowercase.translate(_AMBIG_DELETE_TABLE)
+"""Lettere minuscole senza caratteri ambigui (precalcolate all'import)."""
+
+_UPPER_NOAMB = string.ascii_uppercase.translate(_AMBIG_DELETE_TABLE)
+"""Lettere maiuscole senza caratteri ambigui (precalcolate all'import)."""
+
+_DIGITS_NOAMB = string.digits.translate(_AMBIG_DELETE_TABLE)
+"""Cifre senza caratteri ambigui (i simboli no: DEFAULT_SYMBOLS è personalizzabile)."""
 
 
 # -----------------------------------------------------------------------------
 # Modello di configurazione
 # -----------------------------------------------------------------------------
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PasswordPolicy:
     """Imposta quali categorie di caratteri usare e se permettere ambigui."""
     use_lower: bool = True
@@ -84,60 +107,120 @@ def _filter_ambiguous(chars: str, allow_ambiguous: bool) -> str:
     """Restituisce `chars` filtrando i caratteri ambigui se necessario."""
     if allow_ambiguous:
         return chars
-    return "".join(ch for ch in chars if ch not in AMBIGUOUS)
+    return chars.translate(_AMBIG_DELETE_TABLE)
+
+
+def _is_ambiguous(ch: str) -> bool:
+    """Indica se `ch` è ambiguo con un test sul bitmask (niente hash)."""
+    return bool((_AMBIG_MASK >> ord(ch)) & 1)
 
 
-def _non_empty_or_raise(cats: Iterable[str]) -> None:
+def _non_empty_or_raise(cats: Sequence[str]) -> None:
     """Verifica che tutte le categorie in `cats` siano non vuote."""
-    for cat in cats:
-        if not cat:
-            raise ValueError(
-                "Le opzioni scelte hanno svuotato una categoria. "
-                "Abilita i caratteri ambigui con --allow-ambiguous oppure "
-                "includi più categorie."
-            )
+    if not all(cats):
+        raise ValueError(
+            "Le opzioni scelte hanno svuotato una categoria. "
+            "Abilita i caratteri ambigui con --allow-ambiguous oppure "
+            "includi più categorie."
+        )
 
 
-def build_full_pool(policy: PasswordPolicy) -> str:
-    """Costruisce il pool complessivo di caratteri in base alla policy."""
-    parts: List[str] = []
+def _compute_pools(policy: PasswordPolicy) -> Tuple[Tuple[str, ...], str]:
+    """Ritorna i pool per categoria e quello completo (memoizzati per policy)."""
+    cats, pool = _compute_pools_cached(policy, DEFAULT_SYMBOLS)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Categorie attive: %d", len(cats))
+        logger.debug("Full pool costruito: %s simboli", len(pool))
+    return cats, pool
+
+
+@functools.lru_cache(maxsize=64)
+def _compute_pools_cached(
+    policy: PasswordPolicy, symbols: str
+) -> Tuple[Tuple[str, ...], str]:
+    """Costruisce (una sola volta per policy e simboli) i pool per categoria e quello completo."""
+    # Specializzazione: lettere e cifre (filtrate o no) sono già costanti di modulo;
+    # i simboli fanno parte della chiave di cache e si filtrano qui
+    symbols = _filter_ambiguous(symbols, policy.allow_ambiguous)
+    if policy.allow_ambiguous:
+        lower, upper, digits = string.ascii_lowercase, string.ascii_uppercase, string.digits
+    else:
+        lower, upper, digits = _LOWER_NOAMB, _UPPER_NOAMB, _DIGITS_NOAMB
+
+    cats: List[str] = []
     if policy.use_lower:
-        parts.append(_filter_ambiguous(string.ascii_lowercase, policy.allow_ambiguous))
+        cats.append(lower)
     if policy.use_upper:
-        parts.append(_filter_ambiguous(string.ascii_uppercase, policy.allow_ambiguous))
+        cats.append(upper)
     if policy.use_digits:
-        parts.append(_filter_ambiguous(string.digits, policy.allow_ambiguous))
+        cats.append(digits)
     if policy.use_symbols:
-        parts.append(_filter_ambiguous(DEFAULT_SYMBOLS, policy.allow_ambiguous))
+        cats.append(symbols)
 
-    if not parts:
+    if not cats:
         raise ValueError(
             "Nessuna categoria selezionata: abilita almeno una tra "
             "minuscole/maiuscole/cifre/simboli."
         )
 
-    _non_empty_or_raise(parts)
+    _non_empty_or_raise(cats)
 
-    pool = "".join(parts)
-    pool = "".join(sorted(set(pool)))
-    logger.debug("Full pool costruito: %s simboli", len(pool))
-    return pool
+    # dedup in un solo passaggio, preservando l'ordine delle categorie
+    pool = "".join(dict.fromkeys("".join(cats)))
+    return tuple(cats), pool
+
+
+def build_full_pool(policy: PasswordPolicy) -> str:
+    """Costruisce il pool complessivo di caratteri in base alla policy."""
+    return _compute_pools(policy)[1]
 
 
 def _category_pools(policy: PasswordPolicy) -> List[str]:
     """Ritorna i pool per categoria (garantisce 1 char per categoria)."""
-    cats: List[str] = []
-    if policy.use_lower:
-        cats.append(_filter_ambiguous(string.ascii_lowercase, policy.allow_ambiguous))
-    if policy.use_upper:
-        cats.append(_filter_ambiguous(string.ascii_uppercase, policy.allow_ambiguous))
-    if policy.use_digits:
-        cats.append(_filter_ambiguous(string.digits, policy.allow_ambiguous))
-    if policy.use_symbols:
-        cats.append(_filter_ambiguous(DEFAULT_SYMBOLS, policy.allow_ambiguous))
-    _non_empty_or_raise(cats)
-    logger.debug("Categorie attive: %d", len(cats))
-    return cats
+    return list(_compute_pools(policy)[0])
+
+
+def _secure_indices(pool_size: int, count: int) -> List[int]:
+    """Estrae `count` indici uniformi in [0, pool_size) da pochi buffer casuali.
+
+    Un singolo `secrets.token_bytes` sostituisce `count` chiamate a
+    `secrets.choice`; i byte fuori soglia vengono scartati (rejection
+    sampling) per non introdurre bias del modulo.
+    """
+    if not 0 < pool_size <= 256:
+        raise ValueError("Il pool deve contenere tra 1 e 256 caratteri.")
+    if pool_size & (pool_size - 1) == 0:
+        mask = pool_size - 1
+        return [b & mask for b in secrets.token_bytes(count)]
+
+    threshold = 256 - (256 % pool_size)
+    indices: List[int] = []
+    while len(indices) < count:
+        missing = count - len(indices)
+        # sovra-campiona in base al tasso di scarto atteso
+        raw = secrets.token_bytes(missing * 256 // threshold + 1)
+        indices.extend(b % pool_size for b in raw if b < threshold)
+    del indices[count:]
+    return indices
+
+
+def _fast_secure_shuffle(items: MutableSequence) -> None:
+    """Mescola `items` in place (Fisher-Yates) leggendo un solo buffer casuale.
+
+    L'indice di scambio usa la riduzione di Lemire su 64 bit; il raro caso
+    che introdurrebbe bias viene rigettato ed estratto di nuovo.
+    """
+    n = len(items)
+    buf = secrets.token_bytes(8 * n)
+    for i in range(n - 1, 0, -1):
+        bound = i + 1
+        m = int.from_bytes(buf[8 * i:8 * i + 8], "little") * bound
+        if (m & _U64_MASK) < bound:
+            threshold = (1 << 64) % bound
+            while (m & _U64_MASK) < threshold:
+                m = secrets.randbits(64) * bound
+        j = m >> 64
+        items[i], items[j] = items[j], items[i]
 
 
 def _require_min_length(length: int, min_len: int = MIN_PASSWORD_LENGTH) -> None:
@@ -152,27 +235,80 @@ def _require_min_length(length: int, min_len: int = MIN_PASSWORD_LENGTH) -> None
 def generate_password(length: int = 16, policy: PasswordPolicy = PasswordPolicy()) -> str:
     """Genera una password rispettando la policy fornita."""
     _require_min_length(length)
+    cats, full_pool = _compute_pools(policy)
+    return _generate_from_pools(length, cats, full_pool)
+
+
+@functools.lru_cache(maxsize=64)
+def _encode_pools(
+    cats: Tuple[str, ...], full_pool: str
+) -> Tuple[Tuple[bytes, ...], bytes]:
+    """Codifica (una volta sola) i pool in byte ASCII."""
+    return tuple(cat.encode("ascii") for cat in cats), full_pool.encode("ascii")
+
+
+def _generate_from_pools(length: int, cats: Sequence[str], full_pool: str) -> str:
+    """Genera una password da pool già calcolati (lunghezza già validata)."""
+    if not full_pool.isascii():
+        # DEFAULT_SYMBOLS personalizzato con caratteri non ASCII: niente byte
+        pwd = _generate_from_pools_str(length, cats, full_pool)
+    else:
+        # Pool ASCII: lavoriamo su byte, non su str da 1 char
+        cats_b, pool_b = _encode_pools(tuple(cats), full_pool)
+        if _core_generate is not None:
+            pwd = _core_generate(length, cats_b, pool_b).decode("ascii")
+        else:
+            pwd = _generate_from_pools_py(length, cats_b, pool_b)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Password generata (len=%d, cats=%d, pool=%d)",
+            length,
+            len(cats),
+            len(full_pool),
+        )
+    return pwd
 
-    cats = _category_pools(policy)
-    full_pool = build_full_pool(policy)
 
-    # 1 char garantito per categoria
+def _generate_from_pools_str(length: int, cats: Sequence[str], full_pool: str) -> str:
+    """Percorso su `str` per pool non ASCII (es. simboli personalizzati)."""
     password_chars = [secrets.choice(cat) for cat in cats]
+    password_chars.extend(
+        secrets.choice(full_pool) for _ in range(length - len(password_chars))
+    )
+    _fast_secure_shuffle(password_chars)
+    return "".join(password_chars)
+
+
+def _generate_from_pools_py(
+    length: int, cats_b: Tuple[bytes, ...], pool_b: bytes
+) -> str:
+    """Percorso puro Python di `_generate_from_pools` (senza estensione C)."""
+    buf = bytearray(length)
+
+    # 1 char garantito per categoria, da un unico buffer (rejection sampling)
+    raw = secrets.token_bytes(16)
+    offset = 0
+    for pos, cat in enumerate(cats_b):
+        threshold = 256 - (256 % len(cat))
+        while True:
+            if offset == len(raw):
+                raw = secrets.token_bytes(16)
+                offset = 0
+            b = raw[offset]
+            offset += 1
+            if b < threshold:
+                buf[pos] = cat[b % len(cat)]
+                break
 
     # Riempi il resto
-    remaining = length - len(password_chars)
-    password_chars.extend(secrets.choice(full_pool) for _ in range(remaining))
+    n_cats = len(cats_b)
+    buf[n_cats:] = bytes(
+        pool_b[i] for i in _secure_indices(len(pool_b), length - n_cats)
+    )
 
     # Mescola con RNG sicuro
-    _RNG.shuffle(password_chars)
-    pwd = "".join(password_chars)
-    logger.debug(
-        "Password generata (len=%d, cats=%d, pool=%d)",
-        length,
-        len(cats),
-        len(full_pool),
-    )
-    return pwd
+    _fast_secure_shuffle(buf)
+    return buf.decode("ascii")
 
 
 def estimate_entropy_bits(length: int, pool_size: int) -> float:
@@ -182,6 +318,16 @@ def estimate_entropy_bits(length: int, pool_size: int) -> float:
     return length * math.log2(pool_size)
 
 
+def estimate_entropy_bits_precomputed(length: int, log2_pool: float) -> float:
+    """Come `estimate_entropy_bits`, ma con `log2(pool_size)` già calcolato.
+
+    Utile quando si stima l'entropia di molte lunghezze sullo stesso pool.
+    """
+    if length <= 0:
+        return 0.0
+    return length * log2_pool
+
+
 # -----------------------------------------------------------------------------
 # CLI
 # -----------------------------------------------------------------------------
@@ -210,11 +356,6 @@ def build_parser() -> argparse.ArgumentParser:
     return parser
 
 
-def _bool(enabled: bool) -> bool:
-    """Identità booleana (per rendere esplicito l'intento nel main)."""
-    return bool(enabled)
-
-
 def main(argv: Sequence[str] | None = None) -> None:
     """Entry-point della CLI."""
     parser = build_parser()
@@ -226,15 +367,17 @@ def main(argv: Sequence[str] | None = None) -> None:
         logger.debug("Modalità verbose attiva (DEBUG).")
 
     policy = PasswordPolicy(
-        use_lower=_bool(not args.no_lower),
-        use_upper=_bool(not args.no_upper),
-        use_digits=_bool(not args.no_digits),
-        use_symbols=_bool(not args.no_symbols),
+        use_lower=not args.no_lower,
+        use_upper=not args.no_upper,
+        use_digits=not args.no_digits,
+        use_symbols=not args.no_symbols,
         allow_ambiguous=args.allow_ambiguous,
     )
 
     try:
-        pool_size = len(build_full_pool(policy))
+        cats, full_pool = _compute_pools(policy)
+        pool_size = len(full_pool)
+        log2_pool = math.log2(pool_size) if pool_size > 1 else 0.0
         logger.info(
             "Generazione di %s password (len=%s, pool=%s, policy=%s)",
             args.count,
@@ -243,14 +386,18 @@ def main(argv: Sequence[str] | None = None) -> None:
             policy,
         )
 
-        for idx in range(int(args.count)):
-            pwd = generate_password(length=int(args.length), policy=policy)
+        # Come generate_password: la lunghezza si valida solo se si genera qualcosa
+        if args.count > 0:
+            _require_min_length(args.length)
+
+        for idx in range(args.count):
+            pwd = _generate_from_pools(args.length, cats, full_pool)
             # le password vanno su stdout
             print(pwd)
 
             # DEBUG: dettagli tecnici (solo in verbose)
-            if args.count == 1 and idx == 0:
-                entropy = estimate_entropy_bits(len(pwd), pool_size)
+            if args.count == 1 and idx == 0 and logger.isEnabledFor(logging.DEBUG):
+                entropy = estimate_entropy_bits_precomputed(len(pwd), log2_pool)
                 logger.debug("Entropia ≈ %.1f bit (pool=%s)", entropy, pool_size)
 
     except ValueError as err:
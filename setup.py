@@ -0,0 +1,19 @@
+"""Build opzionale dell'estensione Cython `progetto._core`.
+
+Se Cython non è installato il pacchetto resta puro Python e il generatore
+usa il percorso di fallback in `secure_password_generator`.
+"""
+
+from setuptools import Extension, setup
+
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    EXT_MODULES = []
+else:
+    EXT_MODULES = cythonize(
+        [Extension("progetto._core", ["progetto/_core.pyx"])],
+        language_level=3,
+    )
+
+setup(ext_modules=EXT_MODULES)
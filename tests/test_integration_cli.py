@@ -29,3 +29,14 @@ def test_cli_errors_when_no_categories_selected(capsys):
         main(["--no-lower", "--no-upper", "--no-digits", "--no-symbols"])
     err = capsys.readouterr().err
     assert ("Nessuna categoria selezionata" in err) or ("Le opzioni scelte" in err)
+
+
+def test_cli_category_error_wins_over_length_error(capsys):
+    with pytest.raises(SystemExit):
+        main(["-l", "2", "--no-lower", "--no-upper", "--no-digits", "--no-symbols"])
+    assert "Nessuna categoria selezionata" in capsys.readouterr().err
+
+
+def test_cli_zero_count_skips_length_check(capsys):
+    main(["-l", "2", "-c", "0"])
+    assert capsys.readouterr().out == ""
@@ -2,14 +2,21 @@ import math
 import string
 import pytest
 
+from progetto import secure_password_generator as spg
 from progetto.secure_password_generator import (
     PasswordPolicy,
     generate_password,
     build_full_pool,
     estimate_entropy_bits,
+    estimate_entropy_bits_precomputed,
     MIN_PASSWORD_LENGTH,
     AMBIGUOUS,
     DEFAULT_SYMBOLS,
+    _secure_indices,
+    _fast_secure_shuffle,
+    _is_ambiguous,
+    _encode_pools,
+    _generate_from_pools_py,
 )
 
 def _filtered(s, allow=False):
@@ -26,6 +33,22 @@ def test_build_full_pool_includes_categories_and_no_duplicates():
     assert set(_filtered(string.digits)) <= set(pool)
     assert set(_filtered(DEFAULT_SYMBOLS)) <= set(pool)
 
+@pytest.mark.parametrize("allow", [True, False])
+def test_build_full_pool_follows_custom_symbols(monkeypatch, allow):
+    monkeypatch.setattr(spg, "DEFAULT_SYMBOLS", "abc!|")
+    pool = build_full_pool(PasswordPolicy(True, False, False, True, allow_ambiguous=allow))
+    assert len(pool) == len(set(pool))
+    assert "!" in pool
+    assert ("|" in pool) == allow
+
+def test_generate_password_with_non_ascii_symbols(monkeypatch):
+    monkeypatch.setattr(spg, "DEFAULT_SYMBOLS", "€£§")
+    pol = PasswordPolicy(True, True, True, True, allow_ambiguous=False)
+    pwd = generate_password(12, pol)
+    assert len(pwd) == 12
+    assert set(pwd) <= set(build_full_pool(pol))
+    assert any(ch in "€£§" for ch in pwd)
+
 def test_build_full_pool_raises_if_no_categories():
     with pytest.raises(ValueError):
         build_full_pool(PasswordPolicy(False, False, False, False, False))
@@ -48,3 +71,46 @@ def test_generate_password_requires_min_length():
 ])
 def test_estimate_entropy_bits_basic(length, pool, expected):
     assert math.isclose(estimate_entropy_bits(length, pool), expected, rel_tol=1e-9)
+
+@pytest.mark.parametrize("length,pool", [(0, 10), (10, 1), (16, 83), (32, 94)])
+def test_estimate_entropy_bits_precomputed_matches(length, pool):
+    log2_pool = math.log2(pool) if pool > 1 else 0.0
+    assert math.isclose(
+        estimate_entropy_bits_precomputed(length, log2_pool),
+        estimate_entropy_bits(length, pool),
+        rel_tol=1e-9,
+    )
+
+@pytest.mark.parametrize("pool_size", [1, 2, 10, 64, 94, 129, 256])
+def test_secure_indices_in_range(pool_size):
+    idx = _secure_indices(pool_size, 500)
+    assert len(idx) == 500
+    assert all(0 <= i < pool_size for i in idx)
+
+def test_fast_secure_shuffle_is_a_permutation():
+    items = list(range(100))
+    _fast_secure_shuffle(items)
+    assert sorted(items) == list(range(100))
+
+def test_is_ambiguous_matches_ambiguous_set():
+    for code in range(256):
+        ch = chr(code)
+        assert _is_ambiguous(ch) == (ch in AMBIGUOUS)
+
+@pytest.mark.parametrize("length", [3, 4, 16, 300])
+def test_python_fallback_respects_pools(length):
+    cats_b, pool_b = _encode_pools(("abc", "XYZ", "789"), "abcXYZ789")
+    pwd = _generate_from_pools_py(length, cats_b, pool_b)
+    assert len(pwd) == length
+    assert set(pwd) <= set("abcXYZ789")
+    assert all(any(ch in cat for ch in pwd) for cat in ("abc", "XYZ", "789"))
+
+def test_core_extension_respects_pools():
+    core = pytest.importorskip("progetto._core")
+    cats = (b"abc", b"XYZ", b"789")
+    pool = b"abcXYZ789"
+    for length in (3, 4, 16, 300):
+        pwd = core.generate_from_pools(length, cats, pool)
+        assert len(pwd) == length
+        assert set(pwd) <= set(pool)
+        assert all(any(b in cat for b in pwd) for cat in cats)